@@ -57,8 +57,8 @@ def gpudb_example():
 
     # Clear any existing table with the same name (otherwise we won't be able to
     # create the table)
-    if h_db.has_table( table_name = weather_table_name )['table_exists']:
-        h_db.clear_table( weather_table_name )
+    h_db.clear_table( weather_table_name,
+                      options = { "no_error_if_not_exists": "true" } )
 
     # Create the table from the type
     try:
@@ -3,16 +3,11 @@ from __future__ import print_function
 import argparse
 import datetime
 import logging
+import queue
 import random
 import threading
 import time
-
-try:
-    import queue
-    from queue import Queue
-except ImportError:
-    import Queue as queue
-    from queue import Queue
+from queue import Queue
 
 import gpudb
 from gpudb import GPUdbColumnProperty as GCP, GPUdbRecordColumn as GRC, \
@@ -55,7 +50,7 @@ class QueuedGPUdbTableMonitor(GPUdbTableMonitor.Client):
     """
 
     def __init__(self, db, tablename,
-                 record_queue, options = None):
+                 record_queue, options = None, prefer_decoded = True):
         """ Constructor for QueuedGPUdbTableMonitor class
 
         Args:
@@ -72,6 +67,11 @@ class QueuedGPUdbTableMonitor(GPUdbTableMonitor.Client):
             options (GPUdbTableMonitor.Client.Options):
                 Options instance which is passed on to the super class
                 GPUdbTableMonitor constructor
+
+            prefer_decoded (bool):
+                If True (the default), inserted records are delivered decoded
+                to on_insert_decoded; otherwise the raw bytes are delivered to
+                on_insert_raw
         """
         # Define the callback methods and create the objects of type
         # GPUdbTableMonitor.Callback wrapping the callback methods according to
@@ -81,17 +81,23 @@ class QueuedGPUdbTableMonitor(GPUdbTableMonitor.Client):
         # received. The default behaviour only logs the payloads and does not
         # do anything more useful.
 
+        # Register only one of the two insert callbacks, so that each inserted
+        # record is handed to this class once rather than once raw and once
+        # decoded
+        if prefer_decoded:
+            insert_callback = GPUdbTableMonitor.Callback(GPUdbTableMonitor.Callback.Type.INSERT_DECODED,
+                                                         self.on_insert_decoded,
+                                                         self.on_error,
+                                                         GPUdbTableMonitor.Callback.InsertDecodedOptions( GPUdbTableMonitor.Callback.InsertDecodedOptions.DecodeFailureMode.ABORT ))
+        else:
+            insert_callback = GPUdbTableMonitor.Callback(GPUdbTableMonitor.Callback.Type.INSERT_RAW,
+                                                         self.on_insert_raw,
+                                                         self.on_error)
+
         # Create the list of callbacks objects which are to be passed to the
         # 'GPUdbTableMonitor.Client' class constructor
         callbacks = [
-            GPUdbTableMonitor.Callback(GPUdbTableMonitor.Callback.Type.INSERT_RAW,
-                                      self.on_insert_raw,
-                                      self.on_error),
-
-            GPUdbTableMonitor.Callback(GPUdbTableMonitor.Callback.Type.INSERT_DECODED,
-                                      self.on_insert_decoded,
-                                      self.on_error,
-                                      GPUdbTableMonitor.Callback.InsertDecodedOptions( GPUdbTableMonitor.Callback.InsertDecodedOptions.DecodeFailureMode.ABORT )),
+            insert_callback,
 
             GPUdbTableMonitor.Callback(GPUdbTableMonitor.Callback.Type.UPDATED,
                                       self.on_update,
@@ -126,8 +132,8 @@ class QueuedGPUdbTableMonitor(GPUdbTableMonitor.Client):
             record (bytes): This is a collection of undecoded bytes. Decoding
             is left to the user who uses this callback.
         """
-        self._logger.info("Payload received : %s " % record)
-        self.record_queue.put("Record inserted (raw) = %s" % record)
+        self._logger.info("Payload received : %s ", record)
+        self.record_queue.put(("insert_raw", record))
 
     def on_insert_decoded(self, record):
         """Callback method which is invoked with the decoded payload record
@@ -141,8 +147,8 @@ class QueuedGPUdbTableMonitor(GPUdbTableMonitor.Client):
             u'ts': u'2020-09-28 00:28:37.481119', u'y': -36.840556,
             u'x': 174.74}
         """
-        self._logger.info("Payload received : %s " % record)
-        self.record_queue.put("Record inserted (decoded) = %s" % record)
+        self._logger.info("Payload received : %s ", record)
+        self.record_queue.put(("insert_decoded", record))
 
     def on_update(self, count):
         """Callback method which is invoked with the number of records updated
@@ -151,8 +157,8 @@ class QueuedGPUdbTableMonitor(GPUdbTableMonitor.Client):
         Args:
             count (int): Number of records updated.
         """
-        self._logger.info("Update count : %s " % count)
-        self.record_queue.put("Update count : %s " % count)
+        self._logger.info("Update count : %s ", count)
+        self.record_queue.put(("update", count))
 
     def on_delete(self, count):
         """Callback method which is invoked with the number of records updated
@@ -161,8 +167,8 @@ class QueuedGPUdbTableMonitor(GPUdbTableMonitor.Client):
         Args:
             count (int): Number of records deleted.
         """
-        self._logger.info("Delete count : %s " % count)
-        self.record_queue.put("Delete count : %s " % count)
+        self._logger.info("Delete count : %s ", count)
+        self.record_queue.put(("delete", count))
 
     def on_table_dropped(self, table_name):
         """Callback method which is invoked with the name of the table which
@@ -170,8 +176,8 @@ class QueuedGPUdbTableMonitor(GPUdbTableMonitor.Client):
         Args:
             table_name (str): Name of the table dropped.
         """
-        self._logger.error("Table %s dropped " % table_name)
-        self.record_queue.put("Table %s dropped " % table_name)
+        self._logger.error("Table %s dropped ", table_name)
+        self.record_queue.put(("table_dropped", table_name))
 
     def on_table_altered(self, message):
         """Callback method which is invoked with the name of the table which
@@ -179,8 +185,8 @@ class QueuedGPUdbTableMonitor(GPUdbTableMonitor.Client):
         Args:
             message (str): Name of the table altered.
         """
-        self._logger.error("Table %s altered " % message)
-        self.record_queue.put("Table %s altered " % message)
+        self._logger.error("Table %s altered ", message)
+        self.record_queue.put(("table_altered", message))
 
     def on_error(self, message):
         """Callback method which is invoked with the error message
@@ -189,13 +195,28 @@ class QueuedGPUdbTableMonitor(GPUdbTableMonitor.Client):
             message: The error message; often wrapping an exception
             raised.
         """
-        self._logger.error("Error occurred " % message)
-        self.record_queue.put("Error occurred " % message)
+        self._logger.error("Error occurred : %s", message)
+        self.record_queue.put(("error", message))
 
 
 
 class TableMonitorExampleClient(threading.Thread):
 
+    # Maximum number of queued items printed together in one batch
+    MAX_BATCH_SIZE = 500
+
+    # How each kind of notification queued by QueuedGPUdbTableMonitor is
+    # printed; the payloads are only formatted here, on the client's thread
+    MESSAGE_FORMATS = {
+        "insert_raw": "Record inserted (raw) = {}",
+        "insert_decoded": "Record inserted (decoded) = {}",
+        "update": "Update count : {} ",
+        "delete": "Delete count : {} ",
+        "table_dropped": "Table {} dropped ",
+        "table_altered": "Table {} altered ",
+        "error": "Error occurred : {}",
+    }
+
     def __init__(self, table_monitor, work_queue):
         """
         [summary]
@@ -207,34 +228,75 @@ class TableMonitorExampleClient(threading.Thread):
             work_queue (Queue): A Queue instance shared by this client and
                 the GPUdbTableMonitor.Client subclass for doing the notification
                 message exchange as they are received by the table monitor
-                for various events (table operation related and otherwise)
+                for various events (table operation related and otherwise);
+                each item is a (kind, payload) tuple, keyed as in
+                MESSAGE_FORMATS
         """
 
         super(TableMonitorExampleClient, self).__init__()
         self.table_monitor = table_monitor
         self.work_queue = work_queue
-        self.kill = False
 
     def run(self):
-        while not self.kill:
-            print(self.kill)
-            print("Looking for new items in queue ...")
-            item = self.work_queue.get()  # timeout=1
+        # Keep handling notifications until close() queues the None sentinel;
+        # everything queued ahead of it is still printed
+        while True:
+            item = self.work_queue.get()
+
+            # Take whatever else is already waiting in the queue along with
+            # this item, so a burst of notifications is printed in one go
+            batch = []
+            while item is not None:
+                batch.append(item)
+                if len(batch) == self.MAX_BATCH_SIZE:
+                    break
+                try:
+                    item = self.work_queue.get_nowait()
+                except queue.Empty:
+                    break
+
+            if batch:
+                print("\n".join(self.MESSAGE_FORMATS[kind].format(payload)
+                                for kind, payload in batch))
 
             if item is None:
                 break
-            else:
-                print(item)
 
         print("Exiting Client ...")
 
     def close(self):
         print("In close method ...")
-        self.kill = True
         self.work_queue.put(None)
         self.join()
 
 
+# Base data set, from which cities will be randomly chosen, with a random
+#   new temperature picked for each, per batch loaded
+CITY_DATA = (
+    ("Washington", "DC", "USA", -77.016389, 38.904722, 58.5, "UTC-5"),
+    ("Paris", "TX", "USA", -95.547778, 33.6625, 64.6, "UTC-6"),
+    ("Memphis", "TN", "USA", -89.971111, 35.1175, 63, "UTC-6"),
+    ("Sydney", "Nova Scotia", "Canada", -60.19551, 46.13631, 44.5, "UTC-4"),
+    ("La Paz", "Baja California Sur", "Mexico", -110.310833, 24.142222, 77, "UTC-7"),
+    ("St. Petersburg", "FL", "USA", -82.64, 27.773056, 74.5, "UTC-5"),
+    ("Oslo", "--", "Norway", 10.75, 59.95, 45.5, "UTC+1"),
+    ("Paris", "--", "France", 2.3508, 48.8567, 56.5, "UTC+1"),
+    ("Memphis", "--", "Egypt", 31.250833, 29.844722, 73, "UTC+2"),
+    ("St. Petersburg", "--", "Russia", 30.3, 59.95, 43.5, "UTC+3"),
+    ("Lagos", "Lagos", "Nigeria", 3.384082, 6.455027, 83, "UTC+1"),
+    ("La Paz", "Pedro Domingo Murillo", "Bolivia", -68.15, -16.5, 44, "UTC-4"),
+    ("Sao Paulo", "Sao Paulo", "Brazil", -46.633333, -23.55, 69.5, "UTC-3"),
+    ("Santiago", "Santiago Province", "Chile", -70.666667, -33.45, 62, "UTC-4"),
+    ("Buenos Aires", "--", "Argentina", -58.381667, -34.603333, 65, "UTC-3"),
+    ("Manaus", "Amazonas", "Brazil", -60.016667, -3.1, 83.5, "UTC-4"),
+    ("Sydney", "New South Wales", "Australia", 151.209444, -33.865, 63.5, "UTC+10"),
+    ("Auckland", "--", "New Zealand", 174.74, -36.840556, 60.5, "UTC+12"),
+    ("Jakarta", "--", "Indonesia", 106.816667, -6.2, 83, "UTC+7"),
+    ("Hobart", "--", "Tasmania", 147.325, -42.880556, 56, "UTC+10"),
+    ("Perth", "Western Australia", "Australia", 115.858889, -31.952222, 68, "UTC+8")
+)
+
+
 """ Load random city weather data into a "history" table, in batches.  Each
     batch will be loaded 2 seconds apart, to give the table monitor time to push
     that batch to the message queue and the queue client time to process the
@@ -243,34 +305,8 @@ class TableMonitorExampleClient(threading.Thread):
 
 
 def load_data(table_name):
-    # Base data set, from which cities will be randomly chosen, with a random
-    #   new temperature picked for each, per batch loaded
-    city_data = [
-        ["Washington", "DC", "USA", -77.016389, 38.904722, 58.5, "UTC-5"],
-        ["Paris", "TX", "USA", -95.547778, 33.6625, 64.6, "UTC-6"],
-        ["Memphis", "TN", "USA", -89.971111, 35.1175, 63, "UTC-6"],
-        ["Sydney", "Nova Scotia", "Canada", -60.19551, 46.13631, 44.5, "UTC-4"],
-        ["La Paz", "Baja California Sur", "Mexico", -110.310833, 24.142222, 77, "UTC-7"],
-        ["St. Petersburg", "FL", "USA", -82.64, 27.773056, 74.5, "UTC-5"],
-        ["Oslo", "--", "Norway", 10.75, 59.95, 45.5, "UTC+1"],
-        ["Paris", "--", "France", 2.3508, 48.8567, 56.5, "UTC+1"],
-        ["Memphis", "--", "Egypt", 31.250833, 29.844722, 73, "UTC+2"],
-        ["St. Petersburg", "--", "Russia", 30.3, 59.95, 43.5, "UTC+3"],
-        ["Lagos", "Lagos", "Nigeria", 3.384082, 6.455027, 83, "UTC+1"],
-        ["La Paz", "Pedro Domingo Murillo", "Bolivia", -68.15, -16.5, 44, "UTC-4"],
-        ["Sao Paulo", "Sao Paulo", "Brazil", -46.633333, -23.55, 69.5, "UTC-3"],
-        ["Santiago", "Santiago Province", "Chile", -70.666667, -33.45, 62, "UTC-4"],
-        ["Buenos Aires", "--", "Argentina", -58.381667, -34.603333, 65, "UTC-3"],
-        ["Manaus", "Amazonas", "Brazil", -60.016667, -3.1, 83.5, "UTC-4"],
-        ["Sydney", "New South Wales", "Australia", 151.209444, -33.865, 63.5, "UTC+10"],
-        ["Auckland", "--", "New Zealand", 174.74, -36.840556, 60.5, "UTC+12"],
-        ["Jakarta", "--", "Indonesia", 106.816667, -6.2, 83, "UTC+7"],
-        ["Hobart", "--", "Tasmania", 147.325, -42.880556, 56, "UTC+10"],
-        ["Perth", "Western Australia", "Australia", 115.858889, -31.952222, 68, "UTC+8"]
-    ]
-
     # Grab a handle to the history table for inserting new weather records
-    history_table = gpudb.GPUdbTable(name=table_name, db=h_db)
+    history_table = get_table(h_db, table_name)
 
     random.seed(0)
 
@@ -279,19 +315,18 @@ def load_data(table_name):
 
     for iter in range(5):
 
-        city_updates = []
-
         # Grab a random set of cities
-        cities = random.sample(city_data, k=random.randint(1, int(len(city_data) / 2)))
-
-        # Create a list of weather records to insert
-        for city in cities:
-            # Pick a random temperature for each city at the current time
-            city_update = list(city)
-            city_update[5] = city_update[5] + random.randrange(-10, 10)
-            city_update.append(datetime.datetime.now())
-
-            city_updates.append(city_update)
+        cities = random.sample(CITY_DATA, k=random.randint(1, int(len(CITY_DATA) / 2)))
+
+        # Create a list of weather records to insert, picking a random
+        #   temperature for each city at the current time; all the records in
+        #   a batch share the same timestamp, formatted once as the string the
+        #   "ts" column expects
+        now = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S.%f")
+        city_updates = [
+            list(city[:5]) + [city[5] + random.randrange(-10, 10), city[6], now]
+            for city in cities
+        ]
 
         # Insert the records into the table and allow time for table monitor to
         #   process them before inserting the next batch
@@ -344,11 +379,36 @@ def create_table(table_name):
 
 def clear_table(table_name):
     # Drop all the tables
-    h_db.clear_table(table_name)
+    h_db.clear_table(table_name, options={"no_error_if_not_exists": "true"})
 
 
 # end clear_tables()
 
+# Table handles already created by this example, keyed by connection and
+# table name
+_table_cache = {}
+
+
+def get_table(h_db, table_name):
+    """ Return a handle to the given table on the given connection, creating it
+    only on first use so that repeated lookups don't each cost a round trip to
+    the server.
+    """
+    key = (id(h_db), table_name)
+    table = _table_cache.get(key)
+    if table is None:
+        table = gpudb.GPUdbTable(name=table_name, db=h_db)
+        _table_cache[key] = table
+    return table
+
+
+# end get_table()
+
+
+# Filter selecting the history records removed by delete_records()
+DELETE_EXPRESSION = "state_province = 'Sao Paulo'"
+
+
 def delete_records(h_db, table_name):
     """
 
@@ -359,15 +419,12 @@ def delete_records(h_db, table_name):
 
     """
     print("In delete records ...")
-    history_table = gpudb.GPUdbTable(name=table_name, db=h_db)
-    pre_delete_records = history_table.size()
-    print("Records before = %s" % pre_delete_records)
-    delete_expr = ["state_province = 'Sao Paulo'"]
-    history_table.delete_records(expressions=delete_expr)
-    post_delete_records = history_table.size()
-    print("Records after = %s" % post_delete_records)
+    history_table = get_table(h_db, table_name)
+    response = history_table.delete_records(expressions=[DELETE_EXPRESSION])
+    deleted_records = response["count_deleted"]
+    print("Records deleted = %s" % deleted_records)
 
-    return pre_delete_records - post_delete_records
+    return deleted_records
 
 
 if __name__ == '__main__':
@@ -378,14 +435,14 @@ if __name__ == '__main__':
     parser.add_argument('--host', default='localhost', help='Kinetica host to '
                                                             'run '
                                                             'example against')
-    parser.add_argument('--port', default='9191', help='Kinetica port')
+    parser.add_argument('--port', type=int, default=9191, help='Kinetica port')
     parser.add_argument('--username', help='Username of user to run example with')
     parser.add_argument('--password', help='Password of the given user')
 
     args = parser.parse_args()
 
-    # Establish connection with an instance of Kinetica on port 9191
-    h_db = gpudb.GPUdb(encoding="BINARY", host=args.host, port="9191", 
+    # Establish connection with an instance of Kinetica on the given port
+    h_db = gpudb.GPUdb(encoding="BINARY", host=args.host, port=args.port, 
                        username=args.username, password=args.password)
     
     # Identify the message queue, running on port 9002
@@ -401,7 +458,9 @@ if __name__ == '__main__':
 
     create_table(tablename)
 
-    work_queue = Queue()
+    # Bound the queue so that a client which falls behind makes the monitor's
+    # callbacks wait, instead of letting notifications pile up in memory
+    work_queue = Queue(maxsize=10000)
 
     # create the `QueuedGPUdbTableMonitor` class and pass in the Queue instance.
     monitor = QueuedGPUdbTableMonitor(h_db, tablename,
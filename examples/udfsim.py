@@ -1,12 +1,12 @@
 #!/usr/bin/env python
 
 import argparse
+import datetime
 import decimal
 import gpudb
 import itertools
 import os
 import struct
-import socket
 import sys
 import tempfile
 
@@ -37,16 +37,24 @@ else:
 
 
 def _decode_date(value):
-    return datetime.date(1900 + (value >> 21), (value >> 17) & 0b1111, (value >> 12) & 0b11111)
+    return "%04d-%02d-%02d" % (1900 + (value >> 21), (value >> 17) & 0b1111, (value >> 12) & 0b11111)
 
 
 def _decode_datetime(value):
-    return datetime.datetime(1900 + (value >> 53), (value >> 49) & 0b1111, (value >> 44) & 0b11111,
-                             (value >> 39) & 0b11111, (value >> 33) & 0b111111, (value >> 27) & 0b111111, ((value >> 17) & 0b1111111111) * 1000)
+    return "%04d-%02d-%02d %02d:%02d:%02d.%03d" % (1900 + (value >> 53), (value >> 49) & 0b1111, (value >> 44) & 0b11111,
+                                                   (value >> 39) & 0b11111, (value >> 33) & 0b111111, (value >> 27) & 0b111111, (value >> 17) & 0b1111111111)
+
+
+def _decode_decimal(value):
+    return str(decimal.Decimal(value).scaleb(-4))
+
+
+def _decode_ipv4(value):
+    return "%d.%d.%d.%d" % (value >> 24, (value >> 16) & 0b11111111, (value >> 8) & 0b11111111, value & 0b11111111)
 
 
 def _decode_time(value):
-    return datetime.time(value >> 26, (value >> 20) & 0b111111, (value >> 14) & 0b111111, ((value >> 4) & 0b1111111111) * 1000)
+    return "%02d:%02d:%02d.%03d" % (value >> 26, (value >> 20) & 0b111111, (value >> 14) & 0b111111, (value >> 4) & 0b1111111111)
 
 
 def _encode_date(value):
@@ -58,6 +66,15 @@ def _encode_datetime(value):
            | (value.hour << 39) | (value.minute << 33) | (value.second << 27) | ((value.microsecond // 1000) << 17)
 
 
+def _encode_decimal(value):
+    return int(decimal.Decimal(value).scaleb(4))
+
+
+def _encode_ipv4(value):
+    a, b, c, d = [int(part) for part in value.split(".")]
+    return (a << 24) | (b << 16) | (c << 8) | d
+
+
 def _encode_time(value):
     return (value.hour << 26) | (value.minute << 20) | (value.second << 14) | ((value.microsecond // 1000) << 4)
 
@@ -161,6 +178,8 @@ class ColumnType(object):
 
 
 def get_column_dt(column):
+    properties = frozenset(column.column_properties)
+
     if column.column_type == gpudb.GPUdbRecordColumn._ColumnType.BYTES:
         return ColumnType.BYTES
     elif column.column_type == gpudb.GPUdbRecordColumn._ColumnType.DOUBLE:
@@ -168,45 +187,45 @@ def get_column_dt(column):
     elif column.column_type == gpudb.GPUdbRecordColumn._ColumnType.FLOAT:
         return ColumnType.FLOAT
     elif column.column_type == gpudb.GPUdbRecordColumn._ColumnType.INT:
-        if gpudb.GPUdbColumnProperty.INT8 in column.column_properties:
+        if gpudb.GPUdbColumnProperty.INT8 in properties:
             return ColumnType.INT8
-        elif gpudb.GPUdbColumnProperty.INT16 in column.column_properties:
+        elif gpudb.GPUdbColumnProperty.INT16 in properties:
             return ColumnType.INT16
         else:
             return ColumnType.INT
     elif column.column_type == gpudb.GPUdbRecordColumn._ColumnType.LONG:
-        if gpudb.GPUdbColumnProperty.TIMESTAMP in column.column_properties:
+        if gpudb.GPUdbColumnProperty.TIMESTAMP in properties:
             return ColumnType.TIMESTAMP
         else:
             return ColumnType.LONG
     else:
-        if gpudb.GPUdbColumnProperty.CHAR1 in column.column_properties:
+        if gpudb.GPUdbColumnProperty.CHAR1 in properties:
             return ColumnType.CHAR1
-        elif gpudb.GPUdbColumnProperty.CHAR2 in column.column_properties:
+        elif gpudb.GPUdbColumnProperty.CHAR2 in properties:
             return ColumnType.CHAR2
-        elif gpudb.GPUdbColumnProperty.CHAR4 in column.column_properties:
+        elif gpudb.GPUdbColumnProperty.CHAR4 in properties:
             return ColumnType.CHAR4
-        elif gpudb.GPUdbColumnProperty.CHAR8 in column.column_properties:
+        elif gpudb.GPUdbColumnProperty.CHAR8 in properties:
             return ColumnType.CHAR8
-        elif gpudb.GPUdbColumnProperty.CHAR16 in column.column_properties:
+        elif gpudb.GPUdbColumnProperty.CHAR16 in properties:
             return ColumnType.CHAR16
-        elif gpudb.GPUdbColumnProperty.CHAR32 in column.column_properties:
+        elif gpudb.GPUdbColumnProperty.CHAR32 in properties:
             return ColumnType.CHAR32
-        elif gpudb.GPUdbColumnProperty.CHAR64 in column.column_properties:
+        elif gpudb.GPUdbColumnProperty.CHAR64 in properties:
             return ColumnType.CHAR64
-        elif gpudb.GPUdbColumnProperty.CHAR128 in column.column_properties:
+        elif gpudb.GPUdbColumnProperty.CHAR128 in properties:
             return ColumnType.CHAR128
-        elif gpudb.GPUdbColumnProperty.CHAR256 in column.column_properties:
+        elif gpudb.GPUdbColumnProperty.CHAR256 in properties:
             return ColumnType.CHAR256
-        elif gpudb.GPUdbColumnProperty.DATE in column.column_properties:
+        elif gpudb.GPUdbColumnProperty.DATE in properties:
             return  ColumnType.DATE
-        elif gpudb.GPUdbColumnProperty.DATETIME in column.column_properties:
+        elif gpudb.GPUdbColumnProperty.DATETIME in properties:
             return ColumnType.DATETIME
-        elif gpudb.GPUdbColumnProperty.DECIMAL in column.column_properties:
+        elif gpudb.GPUdbColumnProperty.DECIMAL in properties:
             return ColumnType.DECIMAL
-        elif gpudb.GPUdbColumnProperty.IPV4 in column.column_properties:
+        elif gpudb.GPUdbColumnProperty.IPV4 in properties:
             return ColumnType.IPV4
-        elif gpudb.GPUdbColumnProperty.TIME in column.column_properties:
+        elif gpudb.GPUdbColumnProperty.TIME in properties:
             return ColumnType.TIME
         else:
             return ColumnType.STRING
@@ -240,6 +259,66 @@ def get_dt_size(dt):
     }[dt]
 
 
+# struct format characters of the fixed-width column types whose values can be
+# packed into and unpacked from a column data file in bulk
+
+_bulk_formats = {
+    ColumnType.DOUBLE:    "d",
+    ColumnType.FLOAT:     "f",
+    ColumnType.INT:       "i",
+    ColumnType.INT8:      "b",
+    ColumnType.INT16:     "h",
+    ColumnType.LONG:      "q",
+    ColumnType.TIMESTAMP: "q"
+}
+
+
+# struct format characters and string conversion functions of the fixed-width
+# column types whose values can be unpacked in bulk and then converted
+
+_bulk_conversions = {
+    ColumnType.DATE:     ("i", _decode_date),
+    ColumnType.DATETIME: ("q", _decode_datetime),
+    ColumnType.DECIMAL:  ("q", _decode_decimal),
+    ColumnType.IPV4:     ("I", _decode_ipv4),
+    ColumnType.TIME:     ("i", _decode_time)
+}
+
+
+def get_dt_decoder(dt):
+    # Returns a function that decodes a buffer of count fixed-width values of
+    # the given type into a list
+
+    if dt in _bulk_formats:
+        fmt = _bulk_formats[dt]
+        return lambda value, count: list(struct.unpack("=" + str(count) + fmt, value))
+
+    if dt in _bulk_conversions:
+        fmt, convert = _bulk_conversions[dt]
+        return lambda value, count: [convert(item) for item in struct.unpack("=" + str(count) + fmt, value)]
+
+    size = get_dt_size(dt)
+
+    def decode_chars(value, count):
+        value = value.tobytes()
+        return [_decode_char(value[i:i + size]) for i in range(0, count * size, size)]
+
+    return decode_chars
+
+
+def get_scratch(column, size):
+    # Returns the column's reusable batch buffer, growing it first if it is
+    # smaller than the given size
+
+    scratch = column["scratch"]
+
+    if len(scratch) < size:
+        scratch = bytearray(size)
+        column["scratch"] = scratch
+
+    return scratch
+
+
 def read_column(f, column):
     result = {}
     result["name"] = column.name
@@ -283,141 +362,122 @@ def read_column(f, column):
     result["size"] = get_dt_size(dt)
 
     if not result["var_data"]:
-        result["decode_data"] = {
-            ColumnType.CHAR1: lambda value: _decode_char(_char1_struct.unpack(value)[0]),
-            ColumnType.CHAR2: lambda value: _decode_char(_char2_struct.unpack(value)[0]),
-            ColumnType.CHAR4: lambda value: _decode_char(_char4_struct.unpack(value)[0]),
-            ColumnType.CHAR8: lambda value: _decode_char(_char8_struct.unpack(value)[0]),
-            ColumnType.CHAR16: lambda value: _decode_char(_char16_struct.unpack(value)[0]),
-            ColumnType.CHAR32: lambda value: _decode_char(_char32_struct.unpack(value)[0]),
-            ColumnType.CHAR64: lambda value: _decode_char(_char64_struct.unpack(value)[0]),
-            ColumnType.CHAR128: lambda value: _decode_char(_char128_struct.unpack(value)[0]),
-            ColumnType.CHAR256: lambda value: _decode_char(_char256_struct.unpack(value)[0]),
-            ColumnType.DATE: lambda value: _decode_date(_int32_struct.unpack(value)[0]).strftime("%Y-%m-%d"),
-            ColumnType.DATETIME: lambda value: _decode_datetime(_int64_struct.unpack(value)[0]).strftime("%Y-%m-%d %H:%M:%S.%f")[:-3],
-            ColumnType.DECIMAL: lambda value: decimal.Decimal(_int64_struct.unpack(value)[0]).scaleb(-4),
-            ColumnType.DOUBLE: lambda value: _double_struct.unpack(value)[0],
-            ColumnType.FLOAT: lambda value: _float_struct.unpack(value)[0],
-            ColumnType.INT: lambda value: _int32_struct.unpack(value)[0],
-            ColumnType.INT8: lambda value: _int8_struct.unpack(value)[0],
-            ColumnType.INT16: lambda value: _int16_struct.unpack(value)[0],
-            ColumnType.IPV4: lambda value: socket.inet_ntoa(_int32_struct.unpack(value)[0]),
-            ColumnType.LONG: lambda value: _int64_struct.unpack(value)[0],
-            ColumnType.TIME: lambda value: _decode_time(_int32_struct.unpack(value)[0]).strftime("%H:%M:%S.%f")[:-3],
-            ColumnType.TIMESTAMP: lambda value: _int64_struct.unpack(value)[0]
-        }[dt]
+        result["decode_values"] = get_dt_decoder(dt)
+        result["scratch"] = bytearray()
 
     return result
 
 
-def read_table(f, db):
-    table = read_string(f)
-
-    res = db.show_table(table_name=table, options={"no_error_if_not_exists": "true"})
-
-    if res["status_info"]["status"] != "OK":
-        raise RuntimeError(res["status_info"]["message"])
-
-    if not res["table_name"]:
-        raise RuntimeError("Table " + table + " does not exist")
+def read_column_values(column, count):
+    dt = column["dt"]
+    data = column["data"]
+    null_data = column["null_data"]
+    var_data = column["var_data"]
+    values = []
 
-    type = gpudb.GPUdbRecordType(schema_string=res["type_schemas"][0], column_properties=res["properties"][0])
-    columns = []
+    if var_data:
+        var_pos = column["var_pos"]
 
-    if read_uint64(f) != len(type.columns):
-        raise RuntimeError("Table " + table + " type mismatch")
+        if var_pos == -1:
+            var_pos = data.read(8)
 
-    for type_column in type.columns:
-        column = read_column(f, type_column)
-
-        if column is None:
-            raise RuntimeError("Table " + table + " type mismatch")
-
-        columns.append(column)
+            if len(var_pos) < 8:
+                var_pos = None
+            else:
+                var_pos = _uint64_struct.unpack(var_pos)[0]
 
-    records = []
-    record_count = 0
+        # Each value ends where the next one starts, so read the offsets that
+        # end this batch's values in one go; once the offsets run out the last
+        # value ends at the end of the var data and the column is exhausted
 
-    while True:
-        record = []
+        if var_pos is not None:
+            next_var_pos = data.read(count * 8)
+            next_count = len(next_var_pos) // 8
+            var_positions = [var_pos]
+            var_positions.extend(struct.unpack("=" + str(next_count) + "Q", next_var_pos[:next_count * 8]))
 
-        for column in columns:
-            dt = column["dt"]
-            data = column["data"]
-            null_data = column["null_data"]
-            var_data = column["var_data"]
+            if next_count < count:
+                var_positions.append(column["var_size"])
+                column["var_pos"] = None
+            else:
+                column["var_pos"] = var_positions[-1]
 
-            if var_data:
-                var_pos = column["var_pos"]
+            for i in range(1, len(var_positions)):
+                if var_positions[i] < var_positions[i - 1]:
+                    var_positions = var_positions[:i]
+                    break
 
-                if var_pos == -1:
-                    var_pos = data.read(8)
+            # Read the var data for the whole batch at once and slice the
+            # values out of it, dropping any that were cut short by EOF
 
-                    if len(var_pos) < 8:
-                        break
+            var_start = var_positions[0]
+            var_values = var_data.read(var_positions[-1] - var_start)
 
-                    var_pos = _uint64_struct.unpack(var_pos)[0]
+            for i in range(1, len(var_positions)):
+                if var_positions[i] - var_start > len(var_values):
+                    break
 
-                next_var_pos = data.read(8)
+                values.append(var_values[var_positions[i - 1] - var_start:var_positions[i] - var_start])
 
-                if len(next_var_pos) < 8:
-                    next_var_pos = column["var_size"]
-                else:
-                    next_var_pos = _uint64_struct.unpack(next_var_pos)[0]
+            if dt == ColumnType.STRING:
+                values = [_decode_string(value[:-1]) for value in values]
+    else:
+        # Read the batch into the column's reusable buffer and decode the
+        # values straight out of it
 
-                column["var_pos"] = next_var_pos
+        size = column["size"]
+        value = memoryview(get_scratch(column, count * size))[:count * size]
+        count = data.readinto(value) // size
+        values = column["decode_values"](value[:count * size], count)
 
-                if null_data:
-                    null_value = null_data.read(1)
+    if null_data:
+        # Null values are stored with placeholder data; swap in None for each
+        # value flagged in the null data (this also drops any values beyond
+        # the end of the null data)
+        nulls = bytearray(null_data.read(len(values)))
+        values = [None if null_flag == 1 else value for value, null_flag in zip(values, nulls)]
 
-                    if len(null_value) < 1:
-                        break
+    return values
 
-                    if null_value == b"\x01":
-                        record.append(None)
-                        continue
 
-                if next_var_pos < var_pos:
-                    break
+def read_table(f, db):
+    table = read_string(f)
 
-                if var_pos == next_var_pos:
-                    value = b""
-                else:
-                    value_len = next_var_pos - var_pos
-                    value = var_data.read(value_len)
+    res = db.show_table(table_name=table, options={"no_error_if_not_exists": "true"})
 
-                    if len(value) < value_len:
-                        break
+    if res["status_info"]["status"] != "OK":
+        raise RuntimeError(res["status_info"]["message"])
 
-                if dt == ColumnType.STRING:
-                    value = _decode_string(value[:-1])
+    if not res["table_name"]:
+        raise RuntimeError("Table " + table + " does not exist")
 
-                record.append(value)
-            else:
-                size = column["size"]
-                value = data.read(size)
+    type = gpudb.GPUdbRecordType(schema_string=res["type_schemas"][0], column_properties=res["properties"][0])
+    columns = []
 
-                if len(value) < size:
-                    break
+    if read_uint64(f) != len(type.columns):
+        raise RuntimeError("Table " + table + " type mismatch")
 
-                if null_data:
-                    null_value = null_data.read(1)
+    for type_column in type.columns:
+        column = read_column(f, type_column)
 
-                    if len(null_value) < 1:
-                        break
+        if column is None:
+            raise RuntimeError("Table " + table + " type mismatch")
 
-                    if null_value == b"\x01":
-                        record.append(None)
-                        continue
+        columns.append(column)
 
-                record.append(column["decode_data"](value))
+    record_type = type.record_type
+    record_count = 0
 
-        if len(record) < len(columns):
-            break
+    # Read the records in batches of up to 10000, a column at a time; a batch
+    # ends early (and is the last one) when any column runs out of data. The
+    # records are built as C extension records, which insert_records encodes
+    # in a single native call instead of one Avro encode per record
 
-        records.append(gpudb.GPUdbRecord(type, record).binary_data)
+    while True:
+        column_values = [read_column_values(column, 10000) for column in columns]
+        records = [gpudb.Record(record_type, record) for record in zip(*column_values)]
 
-        if len(records) == 10000:
+        if records:
             if not args.dryrun:
                 res = db.insert_records(table_name=table, data=records, list_encoding="binary", options={})
 
@@ -425,18 +485,17 @@ def read_table(f, db):
                     raise RuntimeError(res["status_info"]["message"])
 
             record_count = record_count + len(records)
-            records = []
 
-    if len(records) > 0:
-        if not args.dryrun:
-            res = db.insert_records(table_name=table, data=records, list_encoding="binary", options={})
+        if len(records) < 10000:
+            break
 
-            if res["status_info"]["status"] != "OK":
-                raise RuntimeError(res["status_info"]["message"])
+    print(table + ": " + str(record_count) + " records")
 
-        record_count = record_count + len(records);
 
-    print(table + ": " + str(record_count) + " records")
+# Column data is written a batch at a time, so give the column files a buffer
+# large enough to hold a typical batch and let it fill before hitting the disk
+
+_column_file_buffering = 1 << 20
 
 
 def write_column(f, column):
@@ -444,21 +503,22 @@ def write_column(f, column):
     result["name"] = column.name
     dt = get_column_dt(column)
     result["dt"] = dt
-    result["data"] = tempfile.NamedTemporaryFile(prefix="kinetica-udf-sim-", dir=args.path, delete=False)
+    result["data"] = tempfile.NamedTemporaryFile(prefix="kinetica-udf-sim-", dir=args.path, delete=False, buffering=_column_file_buffering)
 
     if gpudb.GPUdbColumnProperty.NULLABLE in column.column_properties:
-        result["null_data"] = tempfile.NamedTemporaryFile(prefix="kinetica-udf-sim-", dir=args.path, delete=False)
+        result["null_data"] = tempfile.NamedTemporaryFile(prefix="kinetica-udf-sim-", dir=args.path, delete=False, buffering=_column_file_buffering)
     else:
         result["null_data"] = None
 
     if dt == ColumnType.BYTES or dt == ColumnType.STRING:
-        result["var_data"] = tempfile.NamedTemporaryFile(prefix="kinetica-udf-sim-", dir=args.path, delete=False)
+        result["var_data"] = tempfile.NamedTemporaryFile(prefix="kinetica-udf-sim-", dir=args.path, delete=False, buffering=_column_file_buffering)
     else:
         result["var_data"] = None
 
     result["size"] = get_dt_size(dt)
 
     if not result["var_data"]:
+        result["scratch"] = bytearray()
         result["encode_data"] = {
             ColumnType.CHAR1: lambda value: _char1_struct.pack(_encode_char(value, 1)),
             ColumnType.CHAR2: lambda value: _char2_struct.pack(_encode_char(value, 2)),
@@ -471,17 +531,10 @@ def write_column(f, column):
             ColumnType.CHAR256: lambda value: _char256_struct.pack(_encode_char(value, 256)),
             ColumnType.DATE: lambda value: _int32_struct.pack(_encode_date(datetime.datetime.strptime(value, "%Y-%m-%d"))),
             ColumnType.DATETIME: lambda value: _int64_struct.pack(_encode_datetime(datetime.datetime.strptime(value, "%Y-%m-%d %H:%M:%S.%f"))),
-            ColumnType.DECIMAL: lambda value: _int64_struct.pack(decimal.Decimal(value) * 10000),
-            ColumnType.DOUBLE: lambda value: _double_struct.pack(value),
-            ColumnType.FLOAT: lambda value: _float_struct.pack(value),
-            ColumnType.INT: lambda value: _int32_struct.pack(value),
-            ColumnType.INT8: lambda value: _int8_struct.pack(value),
-            ColumnType.INT16: lambda value: _int16_struct.pack(value),
-            ColumnType.IPV4: lambda value: _int32_struct.pack(socket.inet_aton(value)),
-            ColumnType.LONG: lambda value: _int64_struct.pack(value),
-            ColumnType.TIME: lambda value: _int32_struct.pack(_encode_time(datetime.datetime.strptime(value, "%H:%M:%S.%f"))),
-            ColumnType.TIMESTAMP: lambda value: _int64_struct.pack(value)
-        }[dt]
+            ColumnType.DECIMAL: lambda value: _int64_struct.pack(_encode_decimal(value)),
+            ColumnType.IPV4: lambda value: _uint32_struct.pack(_encode_ipv4(value)),
+            ColumnType.TIME: lambda value: _int32_struct.pack(_encode_time(datetime.datetime.strptime(value, "%H:%M:%S.%f")))
+        }.get(dt)
 
     write_string(f, result["name"])
     write_uint64(f, result["dt"])
@@ -499,33 +552,45 @@ def write_column_data(column, data):
     null_file = column["null_data"]
     size = column["size"]
 
-    if not var_file:
-        encode_data = column["encode_data"]
+    # Encode the whole batch of values for this column, then write the data
+    # out with a single write per file
 
-    for record in data:
-        value = record[name]
+    values = [record[name] for record in data]
 
-        if value is None:
-            null_file.write(b"\x01")
+    if null_file:
+        null_file.write(bytearray([1 if value is None else 0 for value in values]))
 
-            if var_file:
-                write_uint64(data_file, var_file.tell())
-            else:
-                data_file.write(b"\x00" * size)
-        else:
-            if null_file:
-                null_file.write(b"\x00")
+    if var_file:
+        var_pos = var_file.tell()
+        var_positions = []
+        var_values = []
 
-            if var_file:
-                write_uint64(data_file, var_file.tell())
+        for value in values:
+            var_positions.append(var_pos)
 
-                if dt == ColumnType.BYTES:
-                    var_file.write(value)
-                else:
-                    var_file.write(_encode_string(value))
-                    var_file.write(b"\x00")
-            else:
-                data_file.write(encode_data(value))
+            if value is None:
+                continue
+
+            if dt != ColumnType.BYTES:
+                value = _encode_string(value) + b"\x00"
+
+            var_values.append(value)
+            var_pos = var_pos + len(value)
+
+        data_file.write(struct.pack("=" + str(len(var_positions)) + "Q", *var_positions))
+        var_file.write(b"".join(var_values))
+    else:
+        if dt in _bulk_formats:
+            # Pack the whole batch into the column's reusable buffer with a
+            # single struct call, using zero as the placeholder for null values
+            values = [0 if value is None else value for value in values]
+            scratch = get_scratch(column, len(values) * size)
+            struct.pack_into("=" + str(len(values)) + _bulk_formats[dt], scratch, 0, *values)
+            data_file.write(memoryview(scratch)[:len(values) * size])
+        else:
+            encode_data = column["encode_data"]
+            null_value = b"\x00" * size
+            data_file.write(b"".join([null_value if value is None else encode_data(value) for value in values]))
 
 
 def write_table(f, db, table, write_data):
@@ -580,6 +645,11 @@ def write_table(f, db, table, write_data):
 
             i = i + len(res["records_binary"])
 
+    for column in columns:
+        for column_file in (column["data"], column["null_data"], column["var_data"]):
+            if column_file:
+                column_file.close()
+
 
 # Main
 
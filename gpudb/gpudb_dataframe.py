@@ -304,11 +304,11 @@ class DataFrameUtils:
                 end = min(total_rows, _offset + batch_size)
                 slice = converted_df.iloc[_offset:end]
 
-                # Convert to records so we can preserve the column dtypes
-                insert_records = slice.to_records(index=False, column_dtypes=None)
-
-                # Call item() so the types are converted to python native types
-                insert_rows = [list(x.item()) for x in insert_records]
+                # Pull each column out as python native values (tolist()
+                # converts the numpy types) and zip them into rows; this
+                # avoids building an intermediate numpy record array
+                columns = [slice.iloc[:, idx].tolist() for idx in range(slice.shape[1])]
+                insert_rows = [list(row) for row in zip(*columns)]
 
                 gpudb_table.insert_records(insert_rows)
                 progress_bar.update(len(insert_rows))
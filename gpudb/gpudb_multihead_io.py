@@ -39,6 +39,7 @@ import builtins
 import datetime
 import json
 import logging
+import operator
 import random
 import re
 import struct
@@ -1922,6 +1923,16 @@ class _RecordKeyBuilder:
             return None
         # end if
 
+        # Pull all the routing column values out of a record in a single
+        # (C-level) call; itemgetter returns a bare value for a single index,
+        # so wrap that case to always get a tuple back
+        if (len( self.routing_key_indices ) == 1):
+            key_idx = self.routing_key_indices[ 0 ]
+            self._get_key_values = lambda column_values: ( column_values[ key_idx ], )
+        else:
+            self._get_key_values = operator.itemgetter( *self.routing_key_indices )
+        # end if
+
 
         # Calculate the buffer size for this type of objects/records
         # with the given primary (and/or) shard keys
@@ -1951,6 +1962,11 @@ class _RecordKeyBuilder:
             self._key_types.append( column_type )
         # end loop
 
+        # Resolve the _RecordKey add function for each key column once, so
+        # that building a key doesn't need a per-value type lookup
+        self._key_add_functions = [ self._column_type_add_functions[ col_type ]
+                                    for col_type in self._key_types ]
+
 
         # Build the key schema
         key_schema_fields_str = []
@@ -2039,15 +2055,11 @@ class _RecordKeyBuilder:
         # Create and populate a RecordKey object
         record_key = _RecordKey( self._key_buffer_size )
 
-        # Add each routing column's value to the key
-        for i, key_idx in enumerate( self.routing_key_indices ):
-            # Extract the value for the relevant routing column
-            value = column_values[ key_idx ]
-
-            # Based on the column's type, call the appropriate
-            # Record.add_xxx() function
-            col_type = self._key_types[ i ]
-            self._column_type_add_functions[ col_type ]( record_key, value )
+        # Add each routing column's value to the key using the
+        # Record.add_xxx() function appropriate for the column's type
+        for add_function, value in zip( self._key_add_functions,
+                                        self._get_key_values( column_values ) ):
+            add_function( record_key, value )
         # end loop
 
         # Compute the key hash and return the key
@@ -2101,15 +2113,10 @@ class _RecordKeyBuilder:
         # Create and populate a RecordKey object
         record_key = _RecordKey( self._key_buffer_size )
 
-        # Add each routing column's value to the key
-        for i in list( range( 0, len( self.routing_key_indices ) ) ):
-            # Extract the value for the relevant routing column
-            value = key_values[ i ]
-
-            # Based on the column's type, call the appropriate
-            # Record.add_xxx() function
-            col_type = self._key_types[ i ]
-            self._column_type_add_functions[ col_type ]( record_key, value )
+        # Add each routing column's value to the key using the
+        # Record.add_xxx() function appropriate for the column's type
+        for add_function, value in zip( self._key_add_functions, key_values ):
+            add_function( record_key, value )
         # end loop
 
         # Compute the key hash and return the key
@@ -977,6 +977,10 @@ class _BaseTask(threading.Thread):
         that run the specific monitors for insert, update and delete etc.
     """
 
+    # Number of unread messages the subscriber socket will buffer before
+    # ZMQ starts dropping them; large enough to absorb insert bursts
+    _RECEIVE_HIGH_WATER_MARK = 100000
+
     def __init__(self,
                  db,
                  table_name,
@@ -1053,6 +1057,7 @@ class _BaseTask(threading.Thread):
 
         self.type_id = None
         self.type_schema = None
+        self.message_record_type = None
         self.topic_id = ""
         self.context = zmq.Context()
         self.socket = self.context.socket(zmq.SUB)
@@ -1138,8 +1143,14 @@ class _BaseTask(threading.Thread):
             # source and removing the table monitor at the end
             self.topic_id = retval["topic_id"]
 
-            # Retain the type schema for decoding queued messages
+            # Retain the type schema for decoding queued messages, and build
+            # the (c-extension) record type for it once here instead of
+            # parsing the schema once per message received
             self.type_schema = retval["type_schema"]
+            self.message_record_type = RecordType.from_type_schema(
+                label="",
+                type_schema=self.type_schema,
+                properties={})
             return True
         except GPUdbException as gpe:
             self._logger.error(gpe.message)
@@ -1163,6 +1174,10 @@ class _BaseTask(threading.Thread):
         """
         # Connect to queue using specified table monitor URL and topic ID
         self._logger.debug("Starting...")
+
+        # Socket options only apply to connections made after they are set
+        self.socket.setsockopt(zmq.RCVHWM, self._RECEIVE_HIGH_WATER_MARK)
+        self.socket.setsockopt(zmq.TCP_KEEPALIVE, 1)
         self.socket.connect(table_monitor_queue_url)
 
         if sys.version_info[:3] > (3, 0):
@@ -1380,9 +1395,17 @@ class _BaseTask(threading.Thread):
         ret = self.socket.poll(self._options.inactivity_timeout)
 
         if ret != 0:
-            self._logger.debug("Received message .. ")
-            messages = self.socket.recv_multipart()
-            self._process_message(messages)
+            # Drain every message already queued on the socket before polling
+            # again, so that a burst of messages costs a single poll.  The
+            # frames are received without copying them out of zmq; the
+            # payloads are decoded straight from the frame buffers
+            while not self.kill:
+                try:
+                    messages = self.socket.recv_multipart(zmq.NOBLOCK, copy=False)
+                except zmq.Again:
+                    break
+                self._logger.debug("Received message .. ")
+                self._process_message(messages)
 
         else:
             # ret==0, meaning nothing received from socket.
@@ -1404,7 +1427,8 @@ class _BaseTask(threading.Thread):
             This method has to be overridden in the derived classes
 
         Parameters:
-            messages
+            messages (list of zmq.Frame)
+                Multi-part message frames received from a single socket poll.
         """
         raise NotImplementedError(
             "Method '_process_message' of '_BaseTask' must be overridden in the derived classes")
@@ -1554,15 +1578,15 @@ class _InsertWatcherTask(_BaseTask):
         """ Process only messages assuming that they are inserts.
 
         Parameters:
-            messages (list)
-                Multi-part messages received from a single socket poll.
+            messages (list of zmq.Frame)
+                Multi-part message frames received from a single socket poll.
         """
 
         if IS_PYTHON_2:
             topic_id_recvd = "".join(
-                chr(x) for x in bytearray(messages[0], 'utf-8'))
+                chr(x) for x in bytearray(messages[0].bytes, 'utf-8'))
         else:
-            topic_id_recvd = str(messages[0], 'utf-8')
+            topic_id_recvd = str(messages[0].bytes, 'utf-8')
 
         self._logger.info("Topic_id_received = " + topic_id_recvd)
 
@@ -1572,7 +1596,7 @@ class _InsertWatcherTask(_BaseTask):
             if (self.__cb_insert_raw is not None
                     and self.__cb_insert_raw.event_callback is not None):
                 try:
-                    self.__cb_insert_raw.event_callback(message_data)
+                    self.__cb_insert_raw.event_callback(message_data.bytes)
                 except Exception as e:
                     self._logger.error(e)
                     raise GPUdbException(str(e))
@@ -1584,7 +1608,7 @@ class _InsertWatcherTask(_BaseTask):
                     and self.__cb_insert_decoded.event_callback is not None):
                 try:
                     record = dict(GPUdbRecord.decode_binary_data(self.record_type,
-                                                                 message_data)[0])
+                                                                 message_data.buffer)[0])
                     try:
                         self.__cb_insert_decoded.event_callback(record)
                     except Exception as cbe:
@@ -1610,13 +1634,13 @@ class _InsertWatcherTask(_BaseTask):
 
                             self._logger.error("Failed to decode message {} "
                                                "with schema {}".format(
-                                message_data,
+                                message_data.bytes,
                                 self.type_schema))
 
                             if (self.__cb_insert_decoded.error_callback is not None):
                                 self.__cb_insert_decoded.error_callback("Failed to decode message {} "
                                                                         "with schema {}".format(
-                                    message_data,
+                                    message_data.bytes,
                                     self.type_schema))
 
                             self._quit_on_exception(GPUdbTableMonitor.Client._TableEvent.TABLE_ALTERED,
@@ -1630,7 +1654,7 @@ class _InsertWatcherTask(_BaseTask):
                             # subsequent records.
                             self._logger.warning("Failed to decode message {} "
                                                  "with schema {}, skipping to next "
-                                                 "records.".format(message_data,
+                                                 "records.".format(message_data.bytes,
                                                                    self.type_schema))
                             continue
                         else:
@@ -1716,9 +1740,9 @@ class _UpdateWatcherTask(_BaseTask):
 
         if sys.version_info[0] == 2:
             topic_id_recvd = "".join(
-                chr(x) for x in bytearray(messages[0], 'utf-8'))
+                chr(x) for x in bytearray(messages[0].bytes, 'utf-8'))
         else:
-            topic_id_recvd = str(messages[0], 'utf-8')
+            topic_id_recvd = str(messages[0].bytes, 'utf-8')
 
         # Process all messages, skipping the (first) topic frame
 
@@ -1728,9 +1752,8 @@ class _UpdateWatcherTask(_BaseTask):
         if (self.__cb_update is not None
                 and self.__cb_update.event_callback is not None):
             try:
-                returned_obj = dict(
-                    GPUdbRecord.decode_binary_data(self.type_schema, messages[1])[
-                        0])
+                returned_obj = self.message_record_type.decode_records(
+                    messages[1].buffer)[0]
                 self.__cb_update.event_callback(returned_obj["count"])
 
                 self._logger.debug("Topic Id = {} , record = {} "
@@ -1746,7 +1769,7 @@ class _UpdateWatcherTask(_BaseTask):
                         str(e)))
                 self._logger.error("Failed to decode message {} "
                                    "with schema {}".format(
-                    messages[1],
+                    messages[1].bytes,
                     self.type_schema
                 ))
 
@@ -1820,9 +1843,9 @@ class _DeleteWatcherTask(_BaseTask):
 
         if sys.version_info[0] == 2:
             topic_id_recvd = "".join(
-                chr(x) for x in bytearray(messages[0], 'utf-8'))
+                chr(x) for x in bytearray(messages[0].bytes, 'utf-8'))
         else:
-            topic_id_recvd = str(messages[0], 'utf-8')
+            topic_id_recvd = str(messages[0].bytes, 'utf-8')
 
         # Process all messages, skipping the (first) topic frame
 
@@ -1832,9 +1855,8 @@ class _DeleteWatcherTask(_BaseTask):
         if (self.__cb_delete is not None
                 and self.__cb_delete.event_callback is not None):
             try:
-                retobj = dict(
-                    GPUdbRecord.decode_binary_data(self.type_schema, messages[1])[
-                        0])
+                retobj = self.message_record_type.decode_records(
+                    messages[1].buffer)[0]
                 self.__cb_delete.event_callback(retobj["count"])
 
                 self._logger.debug("Topic Id = {} , record = {} "
@@ -1845,7 +1867,7 @@ class _DeleteWatcherTask(_BaseTask):
                     "Exception received while decoding {}".format(str(e)))
 
                 self._logger.error("Failed to decode message {} "
-                                   "with schema {}".format(messages[1],
+                                   "with schema {}".format(messages[1].bytes,
                                                            self.type_schema))
 
     # End _process_message _DeleteWatcherTask(_BaseTask)